@@ -1,9 +1,10 @@
 """Bin packing with reinforcement learning."""
 
-from environments.two_d import BinPackingEnv  # noqa: F401
 from gymnasium.envs.registration import register
 
+from rl_bin_packing.environments.two_d import BinPackingEnv  # noqa: F401
+
 register(
     id="2DBinPackingEnv-v0",
-    entry_point="environments.two_d:BinPackingEnv",
+    entry_point="rl_bin_packing.environments.two_d:BinPackingEnv",
 )
@@ -0,0 +1,82 @@
+"""Contains compiled kernels for the hot paths of containers."""
+
+from typing import Any
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, boundscheck=False)
+def any_overlap(  # noqa: PLR0913
+    xs: np.ndarray[Any, np.dtype[np.int32]],
+    ys: np.ndarray[Any, np.dtype[np.int32]],
+    ls: np.ndarray[Any, np.dtype[np.int32]],
+    hs: np.ndarray[Any, np.dtype[np.int32]],
+    n: int,
+    x0: int,
+    y0: int,
+    x1: int,
+    y1: int,
+) -> bool:
+    """Check if a bounding box overlaps any of the first n packed shipments.
+
+    Args:
+        xs (np.ndarray): The x-coordinates of the packed shipments.
+        ys (np.ndarray): The y-coordinates of the packed shipments.
+        ls (np.ndarray): The lengths of the packed shipments.
+        hs (np.ndarray): The heights of the packed shipments.
+        n (int): The number of packed shipments.
+        x0 (int): The lower x-coordinate of the bounding box.
+        y0 (int): The lower y-coordinate of the bounding box.
+        x1 (int): The upper x-coordinate of the bounding box.
+        y1 (int): The upper y-coordinate of the bounding box.
+
+    Returns:
+        bool: Whether the bounding box overlaps a packed shipment.
+    """
+    for i in range(n):
+        if x0 < xs[i] + ls[i] and xs[i] < x1 and y0 < ys[i] + hs[i] and ys[i] < y1:
+            return True
+    return False
+
+
+@njit(cache=True, boundscheck=False)
+def fill_block(
+    occupancy: np.ndarray[Any, np.dtype[np.uint8]],
+    x: int,
+    y: int,
+    length: int,
+    height: int,
+) -> None:
+    """Mark a block that lies within the bounds of the map as occupied.
+
+    Args:
+        occupancy (np.ndarray): The map of the container.
+        x (int): The lower x-coordinate of the block.
+        y (int): The lower y-coordinate of the block.
+        length (int): The length of the block.
+        height (int): The height of the block.
+    """
+    # Rows are contiguous, so each is written as one slice
+    for i in range(x, x + length):
+        occupancy[i, y : y + height] = 1
+
+
+@njit(cache=True, boundscheck=False)
+def summed_area_table(
+    occupancy: np.ndarray[Any, np.dtype[np.uint8]],
+    out: np.ndarray[Any, np.dtype[np.int32]],
+) -> None:
+    """Compute the summed-area table of a map.
+
+    Args:
+        occupancy (np.ndarray[Any, np.dtype[np.uint8]]): The map of the container.
+        out (np.ndarray[Any, np.dtype[np.int32]]): Table to write into, one row and
+            column larger than the map. Its first row and column must be zero.
+    """
+    length, height = occupancy.shape
+    for i in range(length):
+        row_sum = 0
+        for j in range(height):
+            row_sum += occupancy[i, j]
+            out[i + 1, j + 1] = out[i, j + 1] + row_sum
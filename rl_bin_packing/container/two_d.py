@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from math import sqrt
+from math import hypot
 from typing import Any, Self
 
 import numpy as np
 import plotly.graph_objects as go
 
+from rl_bin_packing.container._kernels import (
+    any_overlap,
+    fill_block,
+    summed_area_table,
+)
+
 
 @dataclass(frozen=True)
 class Shipment:
@@ -55,11 +61,12 @@ class PackedShipment:
     position: Position
 
     @property
-    def center_of_gravity(self: Self) -> Position:
+    def center_of_gravity(self: Self) -> tuple[float, float]:
         """Calculate the center of gravity of the packed shipment."""
-        x = (self.position.x * 2 + self.shipment.length) / 2
-        y = (self.position.y * 2 + self.shipment.height) / 2
-        return Position(x, y)
+        return (
+            self.position.x + self.shipment.length / 2,
+            self.position.y + self.shipment.height / 2,
+        )
 
     def plot_center_of_gravity(self: Self, fig: go.Figure) -> go.Figure:
         """Plot the center of gravity on a Plotly figure.
@@ -70,10 +77,11 @@ class PackedShipment:
         Returns:
             go.Figure: The updated Plotly figure.
         """
+        cog = Position(*self.center_of_gravity)
         return fig.add_trace(
             go.Scatter(
-                x=[self.center_of_gravity.x],
-                y=[self.center_of_gravity.y],
+                x=[cog.x],
+                y=[cog.y],
                 mode="markers",
                 marker={"color": "grey"},
                 name=f"G {self.shipment.identifier or ''}",
@@ -111,23 +119,54 @@ class PackedShipment:
 
 
 class Container:
-    """Represents a container for packing shipments."""
+    """Represents a container for packing shipments.
+
+    Packed shipments are stored as a structure of arrays, one entry per shipment,
+    so that the properties queried at every environment step reduce to NumPy
+    operations. `PackedShipment` objects are only built on demand.
+    """
 
-    shipments: list[PackedShipment]
     length: int
     height: int
 
-    def __init__(self: Self, length: int, height: int) -> None:
+    def __init__(self: Self, length: int, height: int, capacity: int = 16) -> None:
         """Initialize a Container with specified dimensions.
 
         Args:
             length (int): The length of the container.
             height (int): The height of the container.
+            capacity (int): The number of shipments to preallocate space for.
+                Grows on demand. Defaults to 16.
         """
         self.length = length
         self.height = height
-        self.shipments = []
         self.map = self._init_map()
+        self._sat = np.zeros(shape=[length + 1, height + 1], dtype=np.int32)
+        self._sat_stale = True
+        self._packed: list[Shipment] = []
+        self._x = np.zeros(shape=max(capacity, 1), dtype=np.int32)
+        self._y = np.zeros_like(self._x)
+        self._l = np.zeros_like(self._x)
+        self._h = np.zeros_like(self._x)
+        self._w = np.zeros_like(self._x)
+        self._num_packed = 0
+        self._packed_volume = 0
+        self._packed_weight = 0
+        self._valid = True
+
+    @property
+    def shipments(self: Self) -> list[PackedShipment]:
+        """Get the packed shipments."""
+        n = self._num_packed
+        return [
+            PackedShipment(shipment, Position(x, y))
+            for shipment, x, y in zip(
+                self._packed,
+                self._x[:n].tolist(),
+                self._y[:n].tolist(),
+                strict=True,
+            )
+        ]
 
     @property
     def total_volume(self: Self) -> int:
@@ -137,7 +176,7 @@ class Container:
     @property
     def remaining_volume(self: Self) -> int:
         """Calculate the remaining volume in the container."""
-        return self.total_volume - sum(s.shipment.volume for s in self.shipments)
+        return self.total_volume - self._packed_volume
 
     @property
     def degree_of_filling(self: Self) -> float:
@@ -147,88 +186,194 @@ class Container:
     @property
     def weight(self: Self) -> int:
         """Calculate the total weight of the packed shipments."""
-        return sum(ps.shipment.weight for ps in self.shipments)
+        return self._packed_weight
 
     @property
-    def center_of_gravity(self: Self) -> Position:
+    def center_of_gravity(self: Self) -> tuple[float, float]:
         """Calculate the center of gravity of the packed shipments."""
-        cog = Position(0, 0)
-        for ps in self.shipments:
-            cog += ps.center_of_gravity * ps.shipment.weight
-        cog /= self.weight
-        return cog
+        if self._packed_weight == 0:
+            # Without weight there is nothing to balance
+            return self.optimal_center_of_gravity
+        n = self._num_packed
+        weights = self._w[:n]
+        x = np.dot(self._x[:n] + self._l[:n] * 0.5, weights) / self._packed_weight
+        y = np.dot(self._y[:n] + self._h[:n] * 0.5, weights) / self._packed_weight
+        return float(x), float(y)
 
     @property
-    def optimal_center_of_gravity(self: Self) -> Position:
+    def optimal_center_of_gravity(self: Self) -> tuple[float, float]:
         """Get the optimal center of gravity for the container."""
-        return Position(self.length / 2, 0)
+        return self.length / 2, 0.0
 
     @property
     def distance_optimal_cog(self: Self) -> float:
         """Calculate the distance from the optimal center of gravity."""
-        return sqrt(
-            (
-                self.optimal_center_of_gravity.x
-                - self.center_of_gravity.x
-                + self.optimal_center_of_gravity.y
-                - self.center_of_gravity.y
-            )
-            ** 2,
-        )
+        optimal_x, optimal_y = self.optimal_center_of_gravity
+        x, y = self.center_of_gravity
+        return hypot(optimal_x - x, optimal_y - y)
 
     @property
     def valid(self: Self) -> bool:
         """Check if the container is valid."""
-        valid = True
-        valid &= self._check_ouf_bound_shipments()
-        valid &= self._check__non_overlapping_shipments()
-        return valid
-
-    def _init_map(self: Self) -> np.ndarray[Any, np.dtype[np.int8]]:
-        return np.zeros(shape=[self.length, self.height], dtype=np.int8)
-
-    def _update_map(self: Self, ps: PackedShipment) -> None:
-        x_start = ps.position.x
-        y_start = ps.position.y
-        x_end = x_start + ps.shipment.length
-        y_end = y_start + ps.shipment.height
-
-        self.map[x_start:x_end, y_start:y_end] += 1
-
-    def _check_ouf_bound_shipments(self: Self) -> bool:
-        """Check if all shipments are within the bounds of the container."""
-        for packed_shipment in self.shipments:
-            if (
-                packed_shipment.position.x < 0
-                or packed_shipment.position.y < 0
-                or packed_shipment.position.x + packed_shipment.shipment.length
-                > self.length
-                or packed_shipment.position.y + packed_shipment.shipment.height
-                > self.height
-            ):
-                return False
-        return True
-
-    def _check__non_overlapping_shipments(self: Self) -> bool:
-        """Check if there are no overlapping shipments in the container."""
-        for shipment1 in self.shipments:
-            for shipment2 in self.shipments:
-                if shipment1 != shipment2:
-                    x1_1 = shipment1.position.x
-                    y1_1 = shipment1.position.y
-                    x1_2 = x1_1 + shipment1.shipment.length
-                    y1_2 = y1_1 + shipment1.shipment.height
-
-                    x2_1 = shipment2.position.x
-                    y2_1 = shipment2.position.y
-                    x2_2 = x2_1 + shipment2.shipment.length
-                    y2_2 = y2_1 + shipment2.shipment.height
-
-                    if not (
-                        x1_2 <= x2_1 or x2_2 <= x1_1 or y1_2 <= y2_1 or y2_2 <= y1_1
-                    ):
-                        return False
-        return True
+        return self._valid
+
+    def feasible_positions(
+        self: Self,
+        sizes: np.ndarray[Any, np.dtype[np.int32]],
+        out: np.ndarray[Any, np.dtype[np.bool_]] | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        """Find the positions at which shipments fit without overlap or overhang.
+
+        Args:
+            sizes (np.ndarray[Any, np.dtype[np.int32]]): The (length, height) of
+                each shipment, shape (n, 2).
+            out (np.ndarray[Any, np.dtype[np.bool_]] | None): Array of shape
+                (n, length, height) to write the result into. A new one is
+                allocated if None. Defaults to None.
+
+        Returns:
+            np.ndarray[Any, np.dtype[np.bool_]]: Boolean array of shape
+                (n, length, height) that is True where the lower left corner of the
+                shipment can be placed.
+        """
+        if out is None:
+            feasible = np.zeros(
+                shape=[len(sizes), self.length, self.height],
+                dtype=bool,
+            )
+        else:
+            feasible = out
+            feasible[...] = False
+
+        fits_by_size: dict[tuple[int, int], np.ndarray[Any, np.dtype[np.bool_]]] = {}
+        for i, (length, height) in enumerate(sizes.tolist()):
+            if length > self.length or height > self.height:
+                continue
+            if (length, height) not in fits_by_size:
+                fits_by_size[length, height] = self._free_positions(length, height)
+            fits = fits_by_size[length, height]
+            feasible[i, : fits.shape[0], : fits.shape[1]] = fits
+        return feasible
+
+    def can_fit(self: Self, sizes: np.ndarray[Any, np.dtype[np.int32]]) -> bool:
+        """Check if any of the shipments fits without overlap or overhang.
+
+        Args:
+            sizes (np.ndarray[Any, np.dtype[np.int32]]): The (length, height) of
+                each shipment, shape (n, 2).
+
+        Returns:
+            bool: Whether at least one shipment can be placed somewhere.
+        """
+        for length, height in {tuple(size) for size in sizes.tolist()}:
+            if length > self.length or height > self.height:
+                continue
+            if self._free_positions(length, height).any():
+                return True
+        return False
+
+    def clear(self: Self) -> None:
+        """Remove all packed shipments and empty the map, reusing its buffer."""
+        self._packed.clear()
+        self.map.fill(0)
+        self._num_packed = 0
+        self._packed_volume = 0
+        self._packed_weight = 0
+        self._valid = True
+        self._sat_stale = True
+
+    def _init_map(self: Self) -> np.ndarray[Any, np.dtype[np.uint8]]:
+        return np.zeros(shape=[self.length, self.height], dtype=np.uint8)
+
+    def _update_map(  # noqa: PLR0913
+        self: Self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int,
+        in_bounds: bool,
+    ) -> None:
+        # Overlaps are tracked by `valid`, so the map only records occupancy
+        self._sat_stale = True
+        if in_bounds:
+            fill_block(self.map, x0, y0, x1 - x0, y1 - y0)
+        else:
+            # The compiled kernel does not check bounds, slicing clips instead
+            self.map[x0:x1, y0:y1] = 1
+
+    def _free_positions(
+        self: Self,
+        length: int,
+        height: int,
+    ) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        """Find the positions at which a block fits without overlap or overhang.
+
+        Args:
+            length (int): The length of the block, at most the container length.
+            height (int): The height of the block, at most the container height.
+
+        Returns:
+            np.ndarray[Any, np.dtype[np.bool_]]: Boolean array that is True where
+                the lower left corner of the block can be placed, covering the
+                positions from which the block does not overhang.
+        """
+        # Summed-area table of the map, padded with a leading row and column of
+        # zeros, so that the occupied cells of any rectangle take four lookups
+        sat = self._sat
+        if self._sat_stale:
+            summed_area_table(self.map, sat)
+            self._sat_stale = False
+
+        occupied = sat[length:, height:] - sat[: self.length + 1 - length, height:]
+        occupied -= sat[length:, : self.height + 1 - height]
+        occupied += sat[: self.length + 1 - length, : self.height + 1 - height]
+        free: np.ndarray[Any, np.dtype[np.bool_]] = occupied == 0
+        return free[: self.length, : self.height]
+
+    def _grow(self: Self) -> None:
+        """Double the space preallocated for packed shipments."""
+        self._x, self._y, self._l, self._h, self._w = (
+            np.concatenate((a, np.zeros_like(a)))
+            for a in (self._x, self._y, self._l, self._h, self._w)
+        )
+
+    def _check_in_bounds(self: Self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Check if a bounding box lies within the bounds of the container.
+
+        Args:
+            x0 (int): The lower x-coordinate of the bounding box.
+            y0 (int): The lower y-coordinate of the bounding box.
+            x1 (int): The upper x-coordinate of the bounding box.
+            y1 (int): The upper y-coordinate of the bounding box.
+
+        Returns:
+            bool: Whether the bounding box lies within the container.
+        """
+        return x0 >= 0 and y0 >= 0 and x1 <= self.length and y1 <= self.height
+
+    def _check_non_overlapping(self: Self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Check if a bounding box does not overlap any packed shipment.
+
+        Args:
+            x0 (int): The lower x-coordinate of the bounding box.
+            y0 (int): The lower y-coordinate of the bounding box.
+            x1 (int): The upper x-coordinate of the bounding box.
+            y1 (int): The upper y-coordinate of the bounding box.
+
+        Returns:
+            bool: Whether the bounding box is free of packed shipments.
+        """
+        return not any_overlap(
+            self._x,
+            self._y,
+            self._l,
+            self._h,
+            self._num_packed,
+            x0,
+            y0,
+            x1,
+            y1,
+        )
 
     def pack(self: Self, shipment: Shipment, x: int, y: int) -> None:
         """Pack a shipment into the container at the specified position.
@@ -238,9 +383,31 @@ class Container:
             x (int): The x-coordinate of the position to pack the shipment.
             y (int): The y-coordinate of the position to pack the shipment.
         """
-        ps = PackedShipment(shipment, Position(x, y))
-        self.shipments.append(ps)
-        self._update_map(ps)
+        x_end = x + shipment.length
+        y_end = y + shipment.height
+
+        # Shipments are never moved, so checking the new one is sufficient
+        in_bounds = self._check_in_bounds(x, y, x_end, y_end)
+        self._valid = (
+            self._valid
+            and in_bounds
+            and self._check_non_overlapping(x, y, x_end, y_end)
+        )
+
+        n = self._num_packed
+        if n == len(self._x):
+            self._grow()
+        self._x[n] = x
+        self._y[n] = y
+        self._l[n] = shipment.length
+        self._h[n] = shipment.height
+        self._w[n] = shipment.weight
+        self._num_packed += 1
+        self._packed_volume += shipment.volume
+        self._packed_weight += shipment.weight
+
+        self._packed.append(shipment)
+        self._update_map(x, y, x_end, y_end, in_bounds=in_bounds)
 
     def plot_center_of_gravity(self: Self, fig: go.Figure) -> go.Figure:
         """Plot the center of gravity of the container on a Plotly figure.
@@ -251,10 +418,11 @@ class Container:
         Returns:
             go.Figure: The updated Plotly figure.
         """
+        cog = Position(*self.center_of_gravity)
         return fig.add_trace(
             go.Scatter(
-                x=[self.center_of_gravity.x],
-                y=[self.center_of_gravity.y],
+                x=[cog.x],
+                y=[cog.y],
                 mode="markers",
                 marker_symbol="cross-thin",
                 marker_line_width=1,
@@ -312,12 +480,15 @@ class Container:
     def plot_map(self: Self) -> None:
         """Print the container's map using ASCII characters with an outline."""
         print(self.map)
+        # One line per row of cells, top row first, each framed by the outline
+        lines = np.empty(shape=[self.height, self.length + 3], dtype=np.uint8)
+        lines[:, 0] = ord("|")  # Left container outline
+        lines[:, 1:-2] = self.map.T[::-1] + ord("0")
+        lines[:, -2] = ord("|")  # Right container outline
+        lines[:, -1] = ord("\n")
+
         print("+" + "-" * self.length + "+")  # Container top outline
-        for row in self.map.T[::-1]:
-            row_str = "|"  # Left container outline
-            row_str += "".join(["1" if val == 1 else "0" for val in row])
-            row_str += "|"  # Right container outline
-            print(row_str)
+        print(lines.tobytes().decode("ascii"), end="")
         print("+" + "-" * self.length + "+")  # Container bottom outline
 
 
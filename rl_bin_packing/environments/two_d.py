@@ -9,11 +9,54 @@ from rl_bin_packing.container.two_d import Container, Shipment
 
 
 class BinPackingEnv(gym.Env):
-    def __init__(self: Self, container: Container, shipments: list[Shipment]) -> None:
+    def __init__(
+        self: Self,
+        container: Container,
+        shipments: list[Shipment],
+        action_mask_in_info: bool = False,
+    ) -> None:
         self.shipments = shipments
-        self.container = Container(container.length, container.height)
-
+        self.action_mask_in_info = action_mask_in_info
         num_shipments = len(shipments)
+        self.container = Container(
+            container.length,
+            container.height,
+            capacity=num_shipments,
+        )
+        self.shipment_sizes = np.array(
+            [[s.length, s.height] for s in shipments],
+            dtype=np.int32,
+        ).reshape(num_shipments, 2)
+        self.shipment_weights = np.array(
+            [s.weight for s in shipments],
+            dtype=np.int32,
+        )
+        # Every episode starts empty, an action must be feasible from the start
+        if not self.container.can_fit(self.shipment_sizes):
+            msg = "None of the shipments fits into the container."
+            raise ValueError(msg)
+        self.available_shipments = np.ones(num_shipments, dtype=np.uint8)
+        self._shipment_info_stacked = np.concatenate(
+            (self.shipment_sizes, self.shipment_weights[:, None]),
+            axis=1,
+        )
+
+        # The observation is a flat buffer holding the container map followed by
+        # the shipment info, both written in place through views
+        map_size = container.length * container.height
+        self._flat_obs = np.zeros(shape=map_size + num_shipments * 3, dtype=np.int32)
+        self._obs_map = self._flat_obs[:map_size].reshape(
+            container.length,
+            container.height,
+        )
+        self._obs_info = self._flat_obs[map_size:].reshape(num_shipments, 3)
+
+        # Feasible actions, rebuilt in place on first use after the state changed
+        self._action_mask = np.zeros(
+            shape=[num_shipments, container.length, container.height],
+            dtype=bool,
+        )
+        self._action_mask_stale = True
 
         self.reset()
 
@@ -27,36 +70,21 @@ class BinPackingEnv(gym.Env):
         )
 
         # Define observation space
-        self.observation_space = spaces.Dict(
-            {
-                "container_state": spaces.Box(
-                    low=0,
-                    high=1,
-                    shape=(container.length, container.height),
-                    dtype=np.int8,
-                ),
-                "shipment_info": spaces.Box(
-                    low=np.zeros((num_shipments, 3), dtype=np.int32),
-                    high=np.ones((num_shipments, 3), dtype=np.int32)
-                    * np.iinfo(np.int32).max,
-                    dtype=np.int32,
-                ),
-            },
+        high = np.full(self._flat_obs.shape, np.iinfo(np.int32).max, dtype=np.int32)
+        high[:map_size] = 1  # Container state
+        self.observation_space = spaces.Box(
+            low=np.zeros(self._flat_obs.shape, dtype=np.int32),
+            high=high,
+            dtype=np.int32,
         )
 
     def reset(self: Self, seed=None, options=None):
         super().reset(seed=seed)
-        self.container = Container(self.container.length, self.container.height)
-
-        num_shipments = len(self.shipments)
-        self.available_shipments = np.ones(num_shipments, dtype=np.int8)
-        self.shipment_sizes = np.zeros(shape=[num_shipments, 2], dtype=np.int32)
-        self.shipment_weights = np.zeros(shape=num_shipments, dtype=np.int32)
-
-        for i, shipment in enumerate(self.shipments):
-            self.shipment_sizes[i] = shipment.length, shipment.height
-            self.shipment_weights[i] = shipment.weight
-        return self._get_observation(), {}
+        self.container.clear()
+        self.available_shipments.fill(1)
+        self._num_available = len(self.shipments)
+        self._action_mask_stale = True
+        return self._get_observation(), self._get_info()
 
     def step(self: Self, action: tuple[int, int, int]):
         # Parse the action
@@ -69,7 +97,11 @@ class BinPackingEnv(gym.Env):
         self.container.pack(shipment, x, y)
 
         # Remove the shipment from available shipments
-        self.available_shipments[shipment_idx] = 0
+        if self.available_shipments[shipment_idx]:
+            self.available_shipments[shipment_idx] = 0
+            self._num_available -= 1
+
+        self._action_mask_stale = True
 
         # Calculate reward
         reward = self._calculate_reward()
@@ -78,33 +110,59 @@ class BinPackingEnv(gym.Env):
         terminated = self._is_done()
 
         # Return the next observation, reward, done flag, and additional info
-        return self._get_observation(), reward, terminated, False, {}
+        return self._get_observation(), reward, terminated, False, self._get_info()
+
+    def action_masks(self: Self) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        """Get the action masks used by `MaskablePPO`.
+
+        `MaskablePPO` masks each dimension of a `MultiDiscrete` action space
+        independently, so the feasible actions are projected onto the shipment,
+        x- and y-coordinate dimensions and concatenated.
+
+        Returns:
+            np.ndarray[Any, np.dtype[np.bool_]]: Boolean mask of length
+                num_shipments + length + height.
+        """
+        action_mask = self._get_action_mask()
+        return np.concatenate(
+            (
+                action_mask.any(axis=(1, 2)),
+                action_mask.any(axis=(0, 2)),
+                action_mask.any(axis=(0, 1)),
+            ),
+        )
 
     def render(self: Self) -> go.Figure:
         # Render the current state of the environment
         return self.container.plot()
 
-    def _get_observation(self: Self) -> dict:
-        shipment_info = []
-
-        for i, shipment in enumerate(self.shipments):
-            if self.available_shipments[i]:
-                # Include information for available shipments
-                shipment_info.append(
-                    [
-                        shipment.length,
-                        shipment.height,
-                        shipment.weight,
-                    ],
-                )
-            else:
-                # For unavailable shipments, use zeros
-                shipment_info.append([0, 0, 0])
-
-        return {
-            "container_state": self.container.map,
-            "shipment_info": np.array(shipment_info, dtype=np.int32),
-        }
+    def _get_observation(self: Self) -> np.ndarray[Any, np.dtype[np.int32]]:
+        np.copyto(self._obs_map, self.container.map)
+        # Unavailable shipments are zeroed out
+        np.multiply(
+            self._shipment_info_stacked,
+            self.available_shipments[:, None],
+            out=self._obs_info,
+        )
+        # Callers may keep observations across steps, e.g. as terminal observation
+        return self._flat_obs.copy()
+
+    def _get_action_mask(self: Self) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        # Available shipments placed where they fit without overlap or overhang
+        if self._action_mask_stale:
+            self.container.feasible_positions(
+                self.shipment_sizes,
+                out=self._action_mask,
+            )
+            self._action_mask[self.available_shipments == 0] = False
+            self._action_mask_stale = False
+        return self._action_mask
+
+    def _get_info(self: Self) -> dict[str, Any]:
+        # The full mask is large, so it is only included on request
+        if self.action_mask_in_info:
+            return {"action_mask": self._get_action_mask()}
+        return {}
 
     def _calculate_reward(self: Self) -> float | int:
         if not self.container.valid:
@@ -123,6 +181,10 @@ class BinPackingEnv(gym.Env):
 
     def _is_done(self: Self) -> bool:
         # Define your termination conditions
-        if len(self.available_shipments) == 0 or not self.container.valid:
-            return True
-        return False
+        return (
+            self._num_available == 0
+            or not self.container.valid
+            or not self.container.can_fit(
+                self.shipment_sizes[self.available_shipments == 1],
+            )
+        )
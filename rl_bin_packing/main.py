@@ -1,12 +1,17 @@
 """Main entrypoint."""
 
+import os
+from typing import cast
+
+import numpy as np
 from gymnasium import make
-from gymnasium.wrappers import FlattenObservation
 from sb3_contrib import MaskablePPO
-from stable_baselines3 import PPO
+from sb3_contrib.common.maskable.utils import get_action_masks
 from stable_baselines3.common.env_checker import check_env
+from stable_baselines3.common.vec_env import SubprocVecEnv
 
 from rl_bin_packing.container.two_d import Container, Shipment
+from rl_bin_packing.environments.two_d import BinPackingEnv
 from rl_bin_packing.utils import DataClassGenerator
 
 if __name__ == "__main__":
@@ -28,26 +33,60 @@ if __name__ == "__main__":
         container=container,
         shipments=shipments,
     )
-    env = FlattenObservation(env)
     env.reset()
 
     check_env(env, warn=True)
 
-    # model = PPO("MlpPolicy", env, verbose=1, tensorboard_log="logs")
+    # model = MaskablePPO("MlpPolicy", env, verbose=1, tensorboard_log="logs")
     # print("begin training")
     # model.learn(total_timesteps=10)
     # print("done training")
-    # model.save("ppo")
-    model = PPO.load("ppo")
+    # model.save("maskable_ppo")
+    model = MaskablePPO.load("maskable_ppo")
+
+    # Step one environment per CPU in subprocesses and batch the predictions
+    vec_env = SubprocVecEnv(
+        [
+            lambda: make(
+                "2DBinPackingEnv-v0",
+                container=container,
+                shipments=shipments,
+            )
+            for _ in range(os.cpu_count() or 1)
+        ],
+    )
+
+    obs = vec_env.reset()
+    finished = np.zeros(vec_env.num_envs, dtype=bool)
+    episode_returns = np.zeros(vec_env.num_envs)
+    while not finished.all():
+        actions, _ = model.predict(
+            obs,
+            action_masks=get_action_masks(vec_env),
+            deterministic=True,
+        )
+        obs, rewards, dones, _ = vec_env.step(actions)
+        # Only count the first episode of each environment
+        episode_returns += np.where(finished, 0, rewards)
+        finished |= dones
+    vec_env.close()
+    print(
+        f"Episode returns: {episode_returns.round(2).tolist()}, "
+        f"mean: {episode_returns.mean():.2f}",
+    )
 
-    obs = env.reset()
-    while True:
-        action = model.predict(obs)
+    # Finished environments are reset automatically, so the final placement is
+    # rendered from a rollout on the local environment
+    obs, info = env.reset()
+    terminated = False
+    while not terminated:
+        action, _ = model.predict(
+            obs,
+            action_masks=cast(BinPackingEnv, env.unwrapped).action_masks(),
+            deterministic=True,
+        )
         obs, reward, terminated, truncated, info = env.step(action)
-        fig = env.render()
-        if terminated:
-            break
-    fig.show(renderer="browser")
+    env.render().show(renderer="browser")
 
     # gif = GIF(gif_name="random_rollout.gif", gif_path="../gifs")
     # for step_num in range(80):
@@ -1,9 +1,10 @@
 """Useful helpers."""
-import random
 import string
 from dataclasses import fields
 from typing import Any, Self
 
+import numpy as np
+
 
 class DataClassGenerator:
     def __init__(self, data_class: type, **kwargs: Any) -> None:
@@ -11,29 +12,50 @@ class DataClassGenerator:
         self.max_values = kwargs
 
     def generate_instances(self: Self, num_instances: int) -> list[type]:
-        instances = []
-        data_fields = [field.name for field in fields(self.data_class)]
-
-        for _ in range(num_instances):
-            instance_fields = {}
-            for field in data_fields:
-                if field in self.max_values:
-                    max_value = self.max_values[field]
-                    if isinstance(max_value, bool):
-                        instance_fields[field] = random.choice([True, False])
-                    elif isinstance(max_value, float):
-                        instance_fields[field] = random.uniform(1, max_value)
-                    elif isinstance(max_value, str):
-                        letters = [*string.ascii_lowercase]
-                        instance_fields[field] = "".join(
-                            random.choice(letters) for _ in range(len(max_value))
-                        )
-                    else:
-                        instance_fields[field] = random.randint(1, max_value)
-                else:
-                    instance_fields[field] = None
-
-            instance = self.data_class(**instance_fields)
-            instances.append(instance)
-
-        return instances
+        rng = np.random.default_rng()
+        columns: dict[str, list[Any]] = {}
+
+        for field in fields(self.data_class):
+            if field.name not in self.max_values:
+                columns[field.name] = [None] * num_instances
+                continue
+
+            max_value = self.max_values[field.name]
+            column: np.ndarray[Any, Any]
+            if isinstance(max_value, bool):
+                column = rng.integers(0, 2, size=num_instances, dtype=bool)
+            elif isinstance(max_value, float):
+                column = rng.uniform(1, max_value, size=num_instances)
+            elif isinstance(max_value, str):
+                column = self._random_strings(rng, num_instances, len(max_value))
+            else:
+                column = rng.integers(1, max_value, size=num_instances, endpoint=True)
+            columns[field.name] = column.tolist()
+
+        return [
+            self.data_class(**{name: column[i] for name, column in columns.items()})
+            for i in range(num_instances)
+        ]
+
+    @staticmethod
+    def _random_strings(
+        rng: np.random.Generator,
+        num_strings: int,
+        length: int,
+    ) -> np.ndarray[Any, np.dtype[np.str_]]:
+        """Generate random strings of lowercase letters.
+
+        Args:
+            rng (np.random.Generator): The random number generator to draw from.
+            num_strings (int): The number of strings to generate.
+            length (int): The length of each string.
+
+        Returns:
+            np.ndarray[Any, np.dtype[np.str_]]: The generated strings.
+        """
+        if length == 0:
+            return np.full(num_strings, "")
+        letters = np.array([*string.ascii_lowercase])
+        chars = rng.choice(letters, size=(num_strings, length))
+        # Reinterpret each row of single characters as one string
+        return chars.view(f"<U{length}")[:, 0]
@@ -0,0 +1,111 @@
+"""Tests for 2D containers."""
+
+import math
+
+import numpy as np
+
+from rl_bin_packing.container.two_d import Container, Shipment
+
+
+def test_pack_within_bounds_is_valid() -> None:
+    """Test that non-overlapping shipments inside the container are valid."""
+    container = Container(4, 2)
+    container.pack(Shipment(2, 2, 1), x=0, y=0)
+    container.pack(Shipment(2, 2, 1), x=2, y=0)
+    assert container.valid
+
+
+def test_pack_out_of_bounds_is_invalid() -> None:
+    """Test that a shipment sticking out of the container is invalid."""
+    container = Container(4, 2)
+    container.pack(Shipment(2, 2, 1), x=3, y=0)
+    assert not container.valid
+
+
+def test_pack_overlapping_is_invalid() -> None:
+    """Test that partially overlapping shipments are invalid."""
+    container = Container(4, 2)
+    container.pack(Shipment(2, 2, 1), x=0, y=0)
+    container.pack(Shipment(2, 2, 1), x=1, y=1)
+    assert not container.valid
+
+
+def test_pack_identical_shipments_at_same_position_is_invalid() -> None:
+    """Test that the same shipment packed twice at one position is invalid."""
+    container = Container(4, 2)
+    shipment = Shipment(1, 1, 1)
+    container.pack(shipment, x=0, y=0)
+    container.pack(shipment, x=0, y=0)
+    assert not container.valid
+
+
+def test_pack_beyond_capacity() -> None:
+    """Test that packing more shipments than preallocated grows the storage."""
+    container = Container(10, 1, capacity=2)
+    for x in range(10):
+        container.pack(Shipment(1, 1, x + 1), x=x, y=0)
+    assert container.valid
+    assert container.weight == sum(range(1, 11))
+    assert [ps.position.x for ps in container.shipments] == list(range(10))
+
+    container.pack(Shipment(1, 1, 1), x=9, y=0)
+    assert not container.valid
+
+
+def test_clear() -> None:
+    """Test that clearing resets shipments, map, totals and validity."""
+    container = Container(4, 2)
+    container.pack(Shipment(2, 2, 1), x=3, y=0)
+    container.clear()
+
+    assert container.valid
+    assert container.shipments == []
+    assert container.weight == 0
+    assert container.remaining_volume == container.total_volume
+    assert not container.map.any()
+
+    container.pack(Shipment(2, 2, 1), x=0, y=0)
+    assert container.valid
+
+
+def test_distance_optimal_cog_is_euclidean() -> None:
+    """Test that the distance to the optimal center of gravity is Euclidean."""
+    container = Container(10, 4)
+    container.pack(Shipment(2, 2, 1), x=0, y=0)
+    # Center of gravity (1, 1), optimal center of gravity (5, 0)
+    assert container.distance_optimal_cog == math.sqrt(4**2 + 1**2)
+
+
+def test_feasible_positions_matches_brute_force() -> None:
+    """Test the summed-area table lookups against checking every cell."""
+    container = Container(7, 5)
+    container.pack(Shipment(2, 3, 1), x=1, y=1)
+    container.pack(Shipment(3, 1, 1), x=4, y=4)
+    sizes = np.array([[1, 1], [2, 2], [3, 1], [7, 5], [8, 1]], dtype=np.int32)
+
+    feasible = container.feasible_positions(sizes)
+
+    expected = np.zeros_like(feasible)
+    for i, (length, height) in enumerate(sizes):
+        for x in range(container.length - length + 1):
+            for y in range(container.height - height + 1):
+                expected[i, x, y] = not container.map[
+                    x : x + length,
+                    y : y + height,
+                ].any()
+    np.testing.assert_array_equal(feasible, expected)
+
+
+def test_can_fit() -> None:
+    """Test that can_fit detects whether any shipment still has room."""
+    container = Container(4, 2)
+    container.pack(Shipment(3, 2, 1), x=0, y=0)
+    assert container.can_fit(np.array([[2, 2], [1, 2]], dtype=np.int32))
+    assert not container.can_fit(np.array([[2, 2], [5, 1]], dtype=np.int32))
+
+
+def test_center_of_gravity_of_empty_container() -> None:
+    """Test that an empty container reports the optimal center of gravity."""
+    container = Container(10, 4)
+    assert container.center_of_gravity == container.optimal_center_of_gravity
+    assert container.distance_optimal_cog == 0
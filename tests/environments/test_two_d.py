@@ -0,0 +1,84 @@
+"""Tests for 2D environments."""
+
+import numpy as np
+import pytest
+
+from rl_bin_packing.container.two_d import Container, Shipment
+from rl_bin_packing.environments.two_d import BinPackingEnv
+
+
+def make_env(num_shipments: int = 3) -> BinPackingEnv:
+    """Create an environment with room for more unit shipments than given.
+
+    Args:
+        num_shipments (int): The number of unit shipments. Defaults to 3.
+
+    Returns:
+        BinPackingEnv: The environment with a 4x2 container.
+    """
+    shipments = [Shipment(1, 1, 1) for _ in range(num_shipments)]
+    return BinPackingEnv(Container(4, 2), shipments)
+
+
+def test_terminates_once_all_shipments_are_packed() -> None:
+    """Test that packing every shipment once ends the episode."""
+    env = make_env()
+    env.reset()
+    for i in range(2):
+        *_, terminated, _, _ = env.step((i, i, 0))
+        assert not terminated
+    *_, terminated, _, _ = env.step((2, 2, 0))
+    assert terminated
+
+
+def test_repacking_shipment_counts_once() -> None:
+    """Test that selecting an already packed shipment is not counted twice."""
+    num_shipments = 3
+    env = make_env(num_shipments)
+    env.reset()
+    env.step((0, 0, 0))
+    *_, terminated, _, _ = env.step((0, 1, 0))
+    assert not terminated
+    assert env.available_shipments.sum() == num_shipments - 1
+
+    # Counting the repacked shipment twice would end the episode one step early
+    *_, terminated, _, _ = env.step((1, 2, 0))
+    assert not terminated
+    *_, terminated, _, _ = env.step((2, 3, 0))
+    assert terminated
+
+
+def test_action_mask_in_info_is_opt_in() -> None:
+    """Test that the full action mask is only returned in info on request."""
+    env = make_env()
+    _, info = env.reset()
+    assert info == {}
+
+    env = BinPackingEnv(env.container, env.shipments, action_mask_in_info=True)
+    env.reset()
+    *_, info = env.step((0, 0, 0))
+    assert info["action_mask"].shape == (3, 4, 2)
+    assert not info["action_mask"][0].any()
+    assert not info["action_mask"][1:, 0, 0].any()
+    assert info["action_mask"][1:, 1:, :].all()
+
+
+def test_observation_layout() -> None:
+    """Test that the observation holds the map followed by the shipment info."""
+    shipments = [Shipment(1, 2, 3), Shipment(2, 1, 4)]
+    env = BinPackingEnv(Container(3, 2), shipments)
+    first_obs, _ = env.reset()
+    obs, *_ = env.step((0, 0, 0))
+
+    expected_map = np.zeros((3, 2), dtype=np.int32)
+    expected_map[0, :] = 1
+    np.testing.assert_array_equal(obs[:6], expected_map.ravel())
+    np.testing.assert_array_equal(obs[6:], [0, 0, 0, 2, 1, 4])
+    # Earlier observations are not overwritten by later steps
+    np.testing.assert_array_equal(first_obs, [0] * 6 + [1, 2, 3, 2, 1, 4])
+
+
+def test_no_fitting_shipment_raises() -> None:
+    """Test that an environment without any feasible first action is rejected."""
+    with pytest.raises(ValueError, match="None of the shipments fits"):
+        BinPackingEnv(Container(2, 1), [Shipment(3, 1, 1)])